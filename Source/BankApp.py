@@ -1,64 +1,111 @@
 import os
-import json
+import atexit
+import orjson
+import time
 import datetime
+from collections import defaultdict
+from functools import cached_property
 
 DATA_DIR = 'data'
+WAL_CHECKPOINT_INTERVAL = 100  # WAL entries between account snapshots
 
 # Ensure data directory exists
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
+os.makedirs(DATA_DIR, exist_ok=True)
 
 # Utility functions for file read/write with JSON format
 def read_json_file(filename):
     filepath = os.path.join(DATA_DIR, filename)
-    if not os.path.exists(filepath):
+    try:
+        with open(filepath, 'rb') as file:
+            return orjson.loads(file.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
         return []
-    with open(filepath, 'r') as file:
-        try:
-            return json.load(file)
-        except json.JSONDecodeError:
-            return []
 
-def write_json_file(filename, data):
+def write_json_file(filename, data, pretty=False):
+    filepath = os.path.join(DATA_DIR, filename)
+    # Encode up front so the file gets a single write and is never truncated
+    # by a value that fails to serialize. Data files are compact unless a
+    # human-readable copy is asked for.
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    # Write a temporary file and swap it in, so a crash mid-write leaves the
+    # previous version intact
+    tmp_filepath = filepath + '.tmp'
+    with open(tmp_filepath, 'wb') as file:
+        file.write(payload)
+    os.replace(tmp_filepath, filepath)
+
+# JSON Lines files hold one record per line so new records can be appended
+def read_jsonl_file(filename):
+    filepath = os.path.join(DATA_DIR, filename)
+    try:
+        file = open(filepath, 'rb')
+    except FileNotFoundError:
+        return []
+    records = []
+    with file:
+        for line in file:
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue  # skip blank or partially written lines
+    return records
+
+def count_jsonl_records(filename):
     filepath = os.path.join(DATA_DIR, filename)
-    with open(filepath, 'w') as file:
-        json.dump(data, file, indent=4)
+    # Count line endings in raw chunks rather than decoding every record
+    try:
+        with open(filepath, 'rb') as file:
+            return sum(chunk.count(b'\n') for chunk in iter(lambda: file.read(1 << 16), b''))
+    except FileNotFoundError:
+        return 0
+
+# IDs are a one letter prefix followed by a number, e.g. C0001
+def next_id(ids):
+    return max((int(i[1:]) for i in ids), default=0) + 1
+
+# Bound formatters used to mint customer, account and transaction IDs
+_CUST_FMT = "C{:04d}".format
+_ACC_FMT = "A{:06d}".format
+_TX_FMT = "T{:08d}".format
 
 # Customer Class
 class Customer:
+    __slots__ = ('customer_id', 'name', 'address', 'contact', 'accounts')
+
     def __init__(self, customer_id, name, address, contact):
         self.customer_id = customer_id
         self.name = name
         self.address = address
         self.contact = contact
-        self.accounts = []  # list of account numbers
+        self.accounts = []  # list of account numbers, rebuilt from the accounts on load
 
     def to_dict(self):
         return {
             "customer_id": self.customer_id,
             "name": self.name,
             "address": self.address,
-            "contact": self.contact,
-            "accounts": self.accounts
+            "contact": self.contact
         }
 
     @classmethod
     def from_dict(cls, data):
-        cust = cls(data['customer_id'], data['name'], data['address'], data['contact'])
-        cust.accounts = data.get('accounts', [])
-        return cust
+        return cls(data['customer_id'], data['name'], data['address'], data['contact'])
 
 # Base Account class
 class Account:
+    __slots__ = ('account_number', 'customer_id', 'balance', '_dirty')
+
     def __init__(self, account_number, customer_id, balance=0.0):
         self.account_number = account_number
         self.customer_id = customer_id
         self.balance = balance
+        self._dirty = True  # set whenever the saved record is out of date
 
     def deposit(self, amount):
         if amount <= 0:
             raise ValueError("Deposit amount must be positive.")
         self.balance += amount
+        self._dirty = True
 
     def withdraw(self, amount):
         if amount <= 0:
@@ -66,6 +113,7 @@ class Account:
         if amount > self.balance:
             raise ValueError("Insufficient funds.")
         self.balance -= amount
+        self._dirty = True
 
     def get_balance(self):
         return self.balance
@@ -84,11 +132,13 @@ class Account:
 
 # SavingAccount subclass
 class SavingAccount(Account):
+    __slots__ = ()  # interest_rate is shared at class level
     interest_rate = 0.02  # 2% monthly interest as example
 
     def add_monthly_interest(self):
         interest = self.balance * self.interest_rate
         self.balance += interest
+        self._dirty = True
 
     def to_dict(self):
         base_dict = super().to_dict()
@@ -98,12 +148,12 @@ class SavingAccount(Account):
 
     @classmethod
     def from_dict(cls, data):
-        account = cls(data['account_number'], data['customer_id'], data['balance'])
-        cls.interest_rate = data.get('interest_rate', cls.interest_rate)
-        return account
+        return cls(data['account_number'], data['customer_id'], data['balance'])
 
 # CurrentAccount subclass
 class CurrentAccount(Account):
+    __slots__ = ('overdraw_limit',)
+
     def __init__(self, account_number, customer_id, balance=0.0, overdraw_limit=0.0):
         super().__init__(account_number, customer_id, balance)
         self.overdraw_limit = overdraw_limit
@@ -114,6 +164,7 @@ class CurrentAccount(Account):
         if amount > self.balance + self.overdraw_limit:
             raise ValueError("Withdrawal exceeds overdraw limit.")
         self.balance -= amount
+        self._dirty = True
 
     def to_dict(self):
         base_dict = super().to_dict()
@@ -125,15 +176,28 @@ class CurrentAccount(Account):
     def from_dict(cls, data):
         return cls(data['account_number'], data['customer_id'], data['balance'], data.get('overdraw_limit', 0.0))
 
+# Maps the stored account type to the class that loads it
+_ACCOUNT_FACTORY = {
+    "Account": Account.from_dict,
+    "SavingAccount": SavingAccount.from_dict,
+    "CurrentAccount": CurrentAccount.from_dict
+}
+
 # Transaction class
 class Transaction:
+    __slots__ = ('transaction_id', 'timestamp', 'account_number', 'transaction_type', 'amount')
+
     def __init__(self, transaction_id, account_number, transaction_type, amount):
         self.transaction_id = transaction_id
-        self.timestamp = datetime.datetime.now().isoformat()
+        self.timestamp = time.time()  # seconds since the epoch
         self.account_number = account_number
         self.transaction_type = transaction_type  # 'deposit' or 'withdrawal'
         self.amount = amount
 
+    @property
+    def timestamp_iso(self):
+        return datetime.datetime.fromtimestamp(self.timestamp).isoformat()
+
     def to_dict(self):
         return {
             "transaction_id": self.transaction_id,
@@ -146,7 +210,11 @@ class Transaction:
     @classmethod
     def from_dict(cls, data):
         trans = cls(data['transaction_id'], data['account_number'], data['transaction_type'], data['amount'])
-        trans.timestamp = data['timestamp']
+        timestamp = data['timestamp']
+        if isinstance(timestamp, str):
+            # Older records store an ISO formatted timestamp
+            timestamp = datetime.datetime.fromisoformat(timestamp).timestamp()
+        trans.timestamp = timestamp
         return trans
 
 # Bank system managing customers, accounts and transactions
@@ -154,11 +222,46 @@ class BankSystem:
     def __init__(self):
         self.customers_file = 'customers.json'
         self.accounts_file = 'accounts.json'
-        self.transactions_file = 'transactions.json'
+        self.transactions_file = 'transactions.jsonl'
+        self.counters_file = 'counters.json'
+        self.wal_file = 'wal.log'
 
         self.customers = self.load_customers()
         self.accounts = self.load_accounts()
-        self.transactions = self.load_transactions()
+        self._account_dict_cache = {}  # account number -> last saved record
+        self._saving_accounts = [acc for acc in self.accounts.values() if isinstance(acc, SavingAccount)]
+        for acc in self.accounts.values():
+            customer = self.customers.get(acc.customer_id)
+            if customer:
+                customer.accounts.append(acc.account_number)
+        self.load_counters()
+
+        # Transactions are only ever appended, so keep the log open
+        self._tx_fp = open(os.path.join(DATA_DIR, self.transactions_file), 'ab')
+
+        # Balance changes go to a write-ahead log and are folded into
+        # accounts.json at checkpoints instead of on every transaction
+        self._wal = open(os.path.join(DATA_DIR, self.wal_file), 'ab', buffering=0)
+        self._wal_entries = 0
+        if self._wal.tell():
+            # Left over from a run that did not shut down cleanly
+            self.replay_wal()
+            self.checkpoint()
+        atexit.register(self.close)
+
+    # The transaction log is only parsed when history is first requested.
+    # Records stay as plain dicts and are wrapped in Transaction on demand.
+    @cached_property
+    def transactions(self):
+        return self.load_transactions()
+
+    @cached_property
+    def _tx_by_account(self):
+        # Index transactions by account so history lookups skip the full list
+        index = defaultdict(list)
+        for t in self.transactions:
+            index[t['account_number']].append(t)
+        return index
 
     def load_customers(self):
         data = read_json_file(self.customers_file)
@@ -170,39 +273,88 @@ class BankSystem:
 
     def load_accounts(self):
         data = read_json_file(self.accounts_file)
-        accounts = {}
-        for acc_data in data:
-            if acc_data['type'] == "SavingAccount":
-                accounts[acc_data['account_number']] = SavingAccount.from_dict(acc_data)
-            elif acc_data['type'] == "CurrentAccount":
-                accounts[acc_data['account_number']] = CurrentAccount.from_dict(acc_data)
-            else:
-                accounts[acc_data['account_number']] = Account.from_dict(acc_data)
-        return accounts
+        # Resolve the lookups once rather than for every record
+        factory = _ACCOUNT_FACTORY.get
+        default = Account.from_dict
+        return {acc_data['account_number']: factory(acc_data['type'], default)(acc_data) for acc_data in data}
 
     def save_accounts(self):
-        data = [acc.to_dict() for acc in self.accounts.values()]
-        write_json_file(self.accounts_file, data)
+        # Only rebuild the records of accounts that changed since the last save
+        cache = self._account_dict_cache
+        for account_number, acc in self.accounts.items():
+            if acc._dirty:
+                cache[account_number] = acc.to_dict()
+                acc._dirty = False
+        write_json_file(self.accounts_file, list(cache.values()))
+
+    def load_counters(self):
+        # Next IDs are stored so they never depend on how many records exist
+        counters = read_json_file(self.counters_file) or {}
+        self._next_customer_id = counters.get('next_customer_id') or next_id(self.customers)
+        self._next_account_id = counters.get('next_account_id') or next_id(self.accounts)
+        self._next_tx_id = counters.get('next_transaction_id') or count_jsonl_records(self.transactions_file) + 1
+
+    def save_counters(self):
+        data = {
+            "next_customer_id": self._next_customer_id,
+            "next_account_id": self._next_account_id,
+            "next_transaction_id": self._next_tx_id
+        }
+        write_json_file(self.counters_file, data)
+
+    def append_wal(self, transaction, account):
+        entry = {"tx": transaction.transaction_id, "acc": account.account_number, "new_bal": account.balance}
+        self._wal.write(orjson.dumps(entry) + b'\n')
+        self._wal_entries += 1
+        if self._wal_entries >= WAL_CHECKPOINT_INTERVAL:
+            self.checkpoint()
+
+    def replay_wal(self):
+        # Entries hold absolute balances, so the last one per account wins
+        for entry in read_jsonl_file(self.wal_file):
+            account = self.accounts.get(entry['acc'])
+            if account:
+                account.balance = entry['new_bal']
+                account._dirty = True
+            self._next_tx_id = max(self._next_tx_id, next_id([entry['tx']]))
+
+    def checkpoint(self):
+        # Snapshot every balance and counter, after which the WAL is redundant
+        self.save_accounts()
+        self.save_counters()
+        self._wal.truncate(0)
+        self._wal_entries = 0
+
+    def close(self):
+        # Called at exit; safe to call more than once
+        if self._wal.closed:
+            return
+        if self._wal_entries:
+            self.checkpoint()
+        self._wal.close()
+        self._tx_fp.close()
 
     def load_transactions(self):
-        data = read_json_file(self.transactions_file)
-        return [Transaction.from_dict(t) for t in data]
+        return read_jsonl_file(self.transactions_file)
 
-    def save_transactions(self):
-        data = [t.to_dict() for t in self.transactions]
-        write_json_file(self.transactions_file, data)
+    def append_transaction(self, record):
+        # Reuse the open handle; flush so the record is on disk before its WAL entry
+        self._tx_fp.write(orjson.dumps(record) + b'\n')
+        self._tx_fp.flush()
 
     def create_customer(self, name, address, contact):
-        customer_id = f"C{len(self.customers)+1:04d}"
+        customer_id = _CUST_FMT(self._next_customer_id)
+        self._next_customer_id += 1
         customer = Customer(customer_id, name, address, contact)
         self.customers[customer_id] = customer
         self.save_customers()
+        self.save_counters()
         return customer
 
     def create_account(self, customer_id, account_type, initial_deposit=0, overdraw_limit=0):
         if customer_id not in self.customers:
             raise ValueError("Customer does not exist.")
-        account_number = f"A{len(self.accounts)+1:06d}"
+        account_number = _ACC_FMT(self._next_account_id)
 
         if account_type == 'saving':
             account = SavingAccount(account_number, customer_id, initial_deposit)
@@ -211,11 +363,13 @@ class BankSystem:
         else:
             raise ValueError("Invalid account type.")
 
+        self._next_account_id += 1
         self.accounts[account_number] = account
+        if isinstance(account, SavingAccount):
+            self._saving_accounts.append(account)
         self.customers[customer_id].accounts.append(account_number)
 
-        self.save_accounts()
-        self.save_customers()
+        self.checkpoint()
 
         return account
 
@@ -235,13 +389,20 @@ class BankSystem:
             raise ValueError("Invalid transaction type.")
 
         # Log transaction
-        transaction_id = f"T{len(self.transactions)+1:08d}"
+        transaction_id = _TX_FMT(self._next_tx_id)
+        self._next_tx_id += 1
         transaction = Transaction(transaction_id, account_number, transaction_type, amount)
-        self.transactions.append(transaction)
+        record = transaction.to_dict()
+
+        # Only keep the in-memory copies current once they have been loaded
+        if 'transactions' in self.__dict__:
+            self.transactions.append(record)
+        if '_tx_by_account' in self.__dict__:
+            self._tx_by_account[account_number].append(record)
 
         # Save changes
-        self.save_accounts()
-        self.save_transactions()
+        self.append_transaction(record)
+        self.append_wal(transaction, account)
 
         return transaction
 
@@ -252,13 +413,12 @@ class BankSystem:
         return account.get_balance()
 
     def transaction_history(self, account_number):
-        return [t for t in self.transactions if t.account_number == account_number]
+        return [Transaction.from_dict(t) for t in self._tx_by_account.get(account_number, [])]
 
     def add_interest_to_savings(self):
-        for account in self.accounts.values():
-            if isinstance(account, SavingAccount):
-                account.add_monthly_interest()
-        self.save_accounts()
+        for account in self._saving_accounts:
+            account.add_monthly_interest()
+        self.checkpoint()
 
     def create_accounts(self):
         print("\n--- Create Account ---")
@@ -337,7 +497,7 @@ def main():
                 else:
                     print("Transaction History:")
                     for t in transactions:
-                        print(f"{t.timestamp} | {t.transaction_type.title()} | Amount: ${t.amount:.2f} | ID: {t.transaction_id}")
+                        print(f"{t.timestamp_iso} | {t.transaction_type.title()} | Amount: ${t.amount:.2f} | ID: {t.transaction_id}")
 
             elif choice == '6':
                 bank.add_interest_to_savings()